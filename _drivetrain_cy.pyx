@@ -0,0 +1,35 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+AOT-compiled combination search kernel for drivetrain.py.
+
+Mirrors the Numba kernel but pays no JIT warmup at import, which matters
+for short-lived invocations like the module's __main__ block. Build in
+place with:
+
+    python setup.py build_ext --inplace
+"""
+
+cimport numpy as cnp
+
+
+def best_combo(const cnp.int64_t[::1] F, const cnp.int64_t[::1] R,
+               cnp.int64_t target_num, cnp.int64_t target_den):
+    """
+    Searches for the largest front/rear ratio <= target_num / target_den
+    using exact integer cross-multiplication. Returns (best_i, best_j) as
+    indices into F and R, or (-1, -1) when no pair qualifies.
+    """
+    cdef Py_ssize_t bi = -1, bj = -1, i, j
+    cdef cnp.int64_t bf = 0, br = 1, f, r, fd
+    for i in range(F.shape[0]):
+        f = F[i]
+        fd = f * target_den  # invariant across the inner loop
+        for j in range(R.shape[0]):
+            r = R[j]
+            # f/r <= num/den  and  f/r > bf/br, with all terms positive
+            if fd <= r * target_num and f * br > bf * r:
+                bf = f
+                br = r
+                bi = i
+                bj = j
+    return bi, bj
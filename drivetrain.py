@@ -16,18 +16,114 @@ There's also a small unittest suite at the bottom to verify that
 the functionality behaves as expected.
 """
 
+import math
+from fractions import Fraction
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    # AOT-compiled search kernel (see _drivetrain_cy.pyx / setup.py).
+    # Preferred over Numba when built: same inner loop, no JIT warmup.
+    from _drivetrain_cy import best_combo as _best_combo_cy
+except ImportError:
+    _best_combo_cy = None
+
 
 class GearRatioNotFoundError(Exception):
     """Raised when no gear combination is <= a specified target ratio."""
     pass
 
 
+# Cache marker for target ratios known to have no valid combination.
+_NO_COMBO = object()
+
+# Bound at module scope so the formatting loop skips the per-call
+# str.format attribute lookup.
+_FMT = "Front: {}, Rear: {}, Ratio: {:.3f}".format
+
+# Generate a specialized straight-line search only for drivetrains up to
+# this many (front, rear) pairs; beyond that the unrolled code stops paying.
+_SPEC_MAX_PAIRS = 64
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _best_combo(F, R, target_num, target_den):
+        """
+        JIT-compiled search for the largest front/rear ratio <= target.
+
+        The target is given as a rational number target_num / target_den so
+        every comparison is an exact int64 cross-multiplication -- no
+        floating-point division in the loop. Returns (best_i, best_j) as
+        indices into F and R, or (-1, -1) when no pair qualifies.
+        """
+        bi = -1
+        bj = -1
+        bf = np.int64(0)
+        br = np.int64(1)
+        for i in range(F.shape[0]):
+            f = F[i]
+            fd = f * target_den  # invariant across the inner loop
+            for j in range(R.shape[0]):
+                r = R[j]
+                # f/r <= num/den  and  f/r > bf/br, with all terms positive
+                if fd <= r * target_num and f * br > bf * r:
+                    bf = f
+                    br = r
+                    bi = i
+                    bj = j
+        return bi, bj
+
+    # Pay the one-time JIT compile cost at import instead of on the first call.
+    _best_combo(np.ones(1, dtype=np.int64), np.ones(1, dtype=np.int64),
+                np.int64(0), np.int64(1))
+else:
+    _best_combo = None
+
+
+def _ensure_sorted(cogs):
+    """
+    Copies the cog list, sorting only if it isn't already in ascending
+    order. Cog lists from real hardware arrive sorted, so the common case
+    is a single pass with no sort call at all.
+    """
+    cogs = list(cogs)
+    for i in range(1, len(cogs)):
+        if cogs[i - 1] > cogs[i]:
+            cogs.sort()
+            break
+    return cogs
+
+
+def _target_fraction(target_ratio):
+    """
+    Decomposes a target ratio into an exact (numerator, denominator) pair.
+    Float-to-Fraction conversion is lossless, so the comparisons built on
+    this pair match ratio <= target_ratio exactly; approximating here (e.g.
+    with limit_denominator) could round the target up past an achievable
+    ratio and break that contract.
+    """
+    frac = Fraction(target_ratio)
+    return frac.numerator, frac.denominator
+
+
 class Drivetrain:
     """
     This class models a bicycle drivetrain with a set of front cogs and rear cogs. It's designed
     to find a gear combination that approximates a desired ratio and to generate a step-by-step
     shift sequence to get there.
     """
+    # No __dict__ per instance: attribute access is a fixed-offset read,
+    # which matters because the precomputed tables are hit on every step.
+    __slots__ = ('front_cogs', 'rear_cogs', '_F', '_R', '_ratios',
+                 '_f_index', '_r_index', '_front_set', '_rear_set',
+                 '_combo_cache', '_spec_combo', '_kernel_limit')
+
     def __init__(self, front_cogs, rear_cogs):
         """
         Initializes the Drivetrain with sorted front and rear cogs. Sorting them
@@ -38,8 +134,53 @@ class Drivetrain:
         :param rear_cogs: A list of integers representing the tooth counts
                           of the rear cogs.
         """
-        self.front_cogs = sorted(front_cogs)
-        self.rear_cogs = sorted(rear_cogs)
+        self.front_cogs = _ensure_sorted(front_cogs)
+        self.rear_cogs = _ensure_sorted(rear_cogs)
+        # Cached NumPy views of the cogs so the combination search can run
+        # in the compiled kernel instead of a Python double loop.
+        self._F = np.asarray(self.front_cogs, dtype=np.int64)
+        self._R = np.asarray(self.rear_cogs, dtype=np.int64)
+        # Largest target numerator/denominator the compiled kernels can
+        # cross-multiply with a cog without overflowing int64; targets
+        # beyond this take the bigint-safe Python scan instead.
+        max_cog = max(self.front_cogs[-1] if self.front_cogs else 1,
+                      self.rear_cogs[-1] if self.rear_cogs else 1)
+        self._kernel_limit = (2 ** 63 - 1) // max_cog
+        # Precompute every front/rear ratio once, plus tooth-count -> index
+        # maps, so the hot paths do O(1) table lookups instead of repeating
+        # the same divisions on every call.
+        self._f_index = {v: i for i, v in enumerate(self.front_cogs)}
+        self._r_index = {v: i for i, v in enumerate(self.rear_cogs)}
+        self._ratios = (self._F.astype(np.float64)[:, None]
+                        / self._R.astype(np.float64)[None, :])
+        self._front_set = frozenset(self.front_cogs)
+        self._rear_set = frozenset(self.rear_cogs)
+        # Memoized results of the combination search, keyed by target ratio.
+        # The cog lists never change after construction, so entries stay
+        # valid for the lifetime of the instance.
+        self._combo_cache = {}
+        # For the typical small drivetrain, compile a specialized search
+        # with every (front, rear) pair unrolled into straight-line code.
+        n_pairs = len(self.front_cogs) * len(self.rear_cogs)
+        self._spec_combo = (self._build_spec_combo()
+                            if n_pairs <= _SPEC_MAX_PAIRS else None)
+
+    @property
+    def front_set(self):
+        """
+        Frozenset of the front cog tooth counts. Prefer this over the
+        front_cogs list for membership checks -- e.g. validating each gear
+        of a live shift stream -- since lookups are O(1) instead of O(N).
+        """
+        return self._front_set
+
+    @property
+    def rear_set(self):
+        """
+        Frozenset of the rear cog tooth counts. Prefer this over the
+        rear_cogs list for membership checks, as with front_set.
+        """
+        return self._rear_set
 
     @staticmethod
     def gear_ratio(front_teeth, rear_teeth):
@@ -51,30 +192,135 @@ class Drivetrain:
         :return: Floating-point gear ratio.
         """
         return front_teeth / rear_teeth
-    
-    def get_gear_combination(self, target_ratio):
+
+    def _build_spec_combo(self):
         """
-        Determines the gear combination providing the closest ratio that is less than or
-        equal to the target ratio.
-        
+        Generates a search function specialized to this drivetrain's exact
+        cogs. The pairs are ordered by descending ratio at build time, so
+        the emitted function is a chain of integer comparisons that returns
+        at the first pair within the target -- no loops, no indexing, and
+        the first hit is by construction the best one.
+
+        :return: A function (target_num, target_den) -> (best_i, best_j),
+                 returning (-1, -1) when no pair qualifies.
+        """
+        order = sorted(
+            ((i, j)
+             for i in range(len(self.front_cogs))
+             for j in range(len(self.rear_cogs))),
+            key=lambda ij: self._ratios[ij[0], ij[1]],
+            reverse=True,
+        )
+        lines = ["def _spec(tn, td):"]
+        for i, j in order:
+            f = self.front_cogs[i]
+            r = self.rear_cogs[j]
+            lines.append(f"    if {f} * td <= {r} * tn: return {i}, {j}")
+        lines.append("    return -1, -1")
+        namespace = {}
+        exec("\n".join(lines), namespace)
+        return namespace["_spec"]
+
+    def _best_combo_py(self, target_num, target_den):
+        """
+        Pure-Python fallback for the combination search, used when no
+        compiled kernel is available or when the target's rational form is
+        too large for their int64 arithmetic (see _kernel_limit). A single
+        pass with a running maximum -- no intermediate list, no sort, and
+        all comparisons done with exact bigint cross-multiplication rather
+        than floating-point division.
+
+        :param target_num: Numerator of the target ratio.
+        :param target_den: Denominator of the target ratio (positive).
+        :return: (best_i, best_j) indices into the cog lists, or (-1, -1)
+                 when no pair qualifies.
+        """
+        bi = -1
+        bj = -1
+        bf = 0
+        br = 1
+        for i, f in enumerate(self.front_cogs):
+            fd = f * target_den  # invariant across the inner loop
+            for j, r in enumerate(self.rear_cogs):
+                # f/r <= num/den  and  f/r > bf/br, with all terms positive
+                if fd <= r * target_num and f * br > bf * r:
+                    bf = f
+                    br = r
+                    bi = i
+                    bj = j
+        return bi, bj
+
+    def _best_combo_indexed(self, target_ratio):
+        """
+        Memoized core of the combination search. Returns indices into the
+        cog lists rather than tooth counts, so callers that already work in
+        index space (like get_shift_sequence) can use the result directly
+        without reverse lookups.
+
         :param target_ratio: The maximum allowed gear ratio.
-        :return: (front_teeth, rear_teeth, ratio)
+        :return: (best_i, best_j, ratio) with indices into front_cogs and
+                 rear_cogs.
         :raises GearRatioNotFoundError: If no combination is <= target_ratio.
         """
-        valid_combinations = []
-        for f in self.front_cogs:        # f-> 30, 38
-            for r in self.rear_cogs:     # r -> 16, 19, 23, 28
-                ratio = self.gear_ratio(f, r)
-                if ratio <= target_ratio:
-                    valid_combinations.append((f, r, ratio))
+        cached = self._combo_cache.get(target_ratio)
+        if cached is not None:
+            if cached is _NO_COMBO:
+                raise GearRatioNotFoundError(
+                    f"No gear ratio found that is <= {target_ratio}."
+                )
+            return cached
 
-        if not valid_combinations:
+        # Fraction() rejects non-finite targets, so handle them up front:
+        # +inf admits every pair (the answer is the overall largest ratio,
+        # biggest front with smallest rear), while nan and -inf admit none
+        # -- matching what the baseline float comparisons did.
+        if not math.isfinite(target_ratio):
+            if target_ratio > 0 and self.front_cogs and self.rear_cogs:
+                bi = len(self.front_cogs) - 1
+                result = (bi, 0, float(self._ratios[bi, 0]))
+                self._combo_cache[target_ratio] = result
+                return result
             raise GearRatioNotFoundError(
                 f"No gear ratio found that is <= {target_ratio}."
             )
 
-        valid_combinations.sort(key=lambda combo: combo[2], reverse=True)
-        return valid_combinations[0]
+        tn, td = _target_fraction(target_ratio)
+        # The compiled kernels work in int64; the specialized function and
+        # the Python scan use Python bigints and have no such limit.
+        fits_int64 = max(abs(tn), td) <= self._kernel_limit
+        if self._spec_combo is not None:
+            bi, bj = self._spec_combo(tn, td)
+        elif _best_combo_cy is not None and fits_int64:
+            bi, bj = _best_combo_cy(self._F, self._R, tn, td)
+        elif _best_combo is not None and fits_int64:
+            bi, bj = _best_combo(self._F, self._R,
+                                 np.int64(tn), np.int64(td))
+        else:
+            bi, bj = self._best_combo_py(tn, td)
+
+        if bi < 0:
+            self._combo_cache[target_ratio] = _NO_COMBO
+            raise GearRatioNotFoundError(
+                f"No gear ratio found that is <= {target_ratio}."
+            )
+
+        # Only the winning pair's ratio is materialized as a float, straight
+        # from the precomputed table.
+        result = (bi, bj, float(self._ratios[bi, bj]))
+        self._combo_cache[target_ratio] = result
+        return result
+
+    def get_gear_combination(self, target_ratio):
+        """
+        Determines the gear combination providing the closest ratio that is less than or
+        equal to the target ratio.
+
+        :param target_ratio: The maximum allowed gear ratio.
+        :return: (front_teeth, rear_teeth, ratio)
+        :raises GearRatioNotFoundError: If no combination is <= target_ratio.
+        """
+        bi, bj, ratio = self._best_combo_indexed(target_ratio)
+        return (self.front_cogs[bi], self.rear_cogs[bj], ratio)
     
     def get_shift_sequence(self, target_ratio, initial_gear):
         """
@@ -89,53 +335,134 @@ class Drivetrain:
         :param target_ratio: The maximum allowed gear ratio.
         :param initial_gear: List [front_teeth, rear_teeth] describing the starting gears.
         :return: A list of (front_teeth, rear_teeth, ratio) for each shift step.
+        :raises ValueError: If the initial gear is not in the drivetrain.
         """
-        best_combo = self.get_gear_combination(target_ratio)
-        final_front, final_rear, _ = best_combo
+        # Fail fast on a bad starting gear before paying for the search.
         current_front, current_rear = initial_gear
+        if (current_front not in self._front_set
+                or current_rear not in self._rear_set):
+            raise ValueError(f"Initial gear {initial_gear} not in drivetrain.")
 
-        shift_sequence = []
+        f_final, i_final, final_ratio = self._best_combo_indexed(target_ratio)
+        final_front = self.front_cogs[f_final]
+        final_rear = self.rear_cogs[i_final]
+
+        # Already in the target gear: the sequence is just the single
+        # current step, so skip the shift bookkeeping entirely.
+        if current_front == final_front and current_rear == final_rear:
+            return [(current_front, current_rear, final_ratio)]
 
-        def record_step(f, r):
-            shift_sequence.append((f, r, self.gear_ratio(f, r)))
+        # Bind the hot names once: the append method, the ratio table, and
+        # the index of each current cog. Every step below is then a direct
+        # table read plus one append -- no closure, no method lookups.
+        shift_sequence = []
+        append = shift_sequence.append
+        ratios = self._ratios
+        fi = self._f_index[current_front]
+        ri = self._r_index[current_rear]
 
         # Record initial gear
-        record_step(current_front, current_rear)
+        append((current_front, current_rear, float(ratios[fi, ri])))
 
         # Switch front cog directly
         if current_front != final_front:
             current_front = final_front
-            record_step(current_front, current_rear)
+            fi = f_final
+            append((current_front, current_rear, float(ratios[fi, ri])))
 
-        # Step through rear cogs
+        # Step through rear cogs; the search already handed us the final
+        # index, and the walk starts one past the current index so every
+        # visited cog is a real shift.
         if current_rear != final_rear:
-            #if final rear cog is greater than current rear cog, move up in rear cogs
-            if final_rear > current_rear:
-                # Ascending through the rear cogs
-                candidate_rears = [r for r in self.rear_cogs if r >= current_rear]
-            #if final rear cog is smaller than current rear cog, move down in rear cogs
-            else:
-                # Descending through the rear cogs
-                candidate_rears = [r for r in reversed(self.rear_cogs) if r <= current_rear]
-
-            
-            #candidate_rears = All possible rear cogs we can shift through
-            step_index = candidate_rears.index(current_rear)   #find index of current rear
-            final_index = candidate_rears.index(final_rear)    #find index of final rear
-
-            if final_index >= step_index: #shifting to larger cog -> move forward in list
-                step_range = range(step_index, final_index + 1)
-            else:
-                step_range = range(step_index, final_index - 1, -1)
-
-            for i in step_range:
-                new_rear = candidate_rears[i]
-                if new_rear != current_rear:
-                    current_rear = new_rear
-                    record_step(current_front, current_rear)
+            step = 1 if i_final >= ri else -1
+            for k in range(ri + step, i_final + step, step):
+                append((current_front, self.rear_cogs[k], float(ratios[fi, k])))
 
         return shift_sequence
-    
+
+    def get_shift_sequence_arrays(self, target_ratio, initial_gear):
+        """
+        Structure-of-arrays variant of get_shift_sequence. Returns the same
+        steps as three parallel contiguous NumPy arrays instead of a list of
+        per-step tuples, so downstream analysis (largest jump, summary
+        stats, plotting) can run vectorized with no Python object per step.
+
+        :param target_ratio: The maximum allowed gear ratio.
+        :param initial_gear: List [front_teeth, rear_teeth] describing the starting gears.
+        :return: (fronts, rears, ratios) as int32, int32 and float32 arrays.
+        :raises ValueError: If the initial gear is not in the drivetrain.
+        """
+        current_front, current_rear = initial_gear
+        if (current_front not in self._front_set
+                or current_rear not in self._rear_set):
+            raise ValueError(f"Initial gear {initial_gear} not in drivetrain.")
+
+        f_final, i_final, _ = self._best_combo_indexed(target_ratio)
+        final_front = self.front_cogs[f_final]
+        fi = self._f_index[current_front]
+        ri = self._r_index[current_rear]
+
+        # The sequence length is known up front, so allocate exactly once.
+        n = 1 + (current_front != final_front) + abs(i_final - ri)
+        fronts = np.empty(n, dtype=np.int32)
+        rears = np.empty(n, dtype=np.int32)
+        ratios = np.empty(n, dtype=np.float32)
+
+        fronts[0] = current_front
+        rears[0] = current_rear
+        ratios[0] = self._ratios[fi, ri]
+        k = 1
+
+        if current_front != final_front:
+            fi = f_final
+            fronts[k] = final_front
+            rears[k] = current_rear
+            ratios[k] = self._ratios[fi, ri]
+            k += 1
+
+        if i_final != ri:
+            step = 1 if i_final >= ri else -1
+            js = np.arange(ri + step, i_final + step, step)
+            fronts[k:] = final_front
+            rears[k:] = self._R[js]
+            ratios[k:] = self._ratios[fi, js]
+
+        return fronts, rears, ratios
+
+    def get_shift_sequences_batch(self, target_ratios, initial_gears):
+        """
+        Computes shift sequences for many (target_ratio, initial_gear)
+        pairs at once. Each distinct target is resolved once through the
+        memoized combination search, so replaying telemetry with repeated
+        targets costs one search per unique target rather than one per
+        call, and every sequence is filled through the array variant.
+
+        :param target_ratios: Sequence of maximum allowed gear ratios.
+        :param initial_gears: Sequence of [front_teeth, rear_teeth] pairs,
+                              one per target ratio.
+        :return: A list of (fronts, rears, ratios) array triples, one per
+                 input pair, as produced by get_shift_sequence_arrays.
+        :raises ValueError: If the input lengths differ or an initial gear
+                            is not in the drivetrain.
+        :raises GearRatioNotFoundError: If any target has no combination.
+        """
+        targets = np.asarray(target_ratios, dtype=np.float64)
+        if targets.shape[0] != len(initial_gears):
+            raise ValueError(
+                "target_ratios and initial_gears must have the same length."
+            )
+        target_list = targets.tolist()
+
+        # Resolve distinct targets through the same exact search the scalar
+        # API uses. A float comparison against the ratio table here would
+        # give subtly different answers at representation boundaries and
+        # poison the shared memo cache with call-order-dependent entries.
+        for t in set(target_list):
+            self._best_combo_indexed(t)
+
+        return [self.get_shift_sequence_arrays(t, gear)
+                for t, gear in zip(target_list, initial_gears)]
+
     def format_shift_sequence(self, shift_sequence):
         """
         Returns a multiline string describing each step in the shift sequence.
@@ -143,10 +470,7 @@ class Drivetrain:
         :param shift_sequence: List of (front_teeth, rear_teeth, ratio).
         :return: A multiline string with each step on its own line.
         """
-        lines = []
-        for (f, r, ratio) in shift_sequence:
-            lines.append(f"Front: {f}, Rear: {r}, Ratio: {ratio:.3f}")
-        return "\n".join(lines)
+        return "\n".join(_FMT(f, r, ratio) for f, r, ratio in shift_sequence)
     
 
 if __name__ == "__main__":
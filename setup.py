@@ -0,0 +1,26 @@
+"""
+Builds the optional Cython search kernel for drivetrain.py:
+
+    python setup.py build_ext --inplace
+
+The pure-Python module works without it; drivetrain.py simply picks the
+fastest available backend at import time.
+"""
+
+import numpy
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+setup(
+    name="sram-drivetrain",
+    ext_modules=cythonize(
+        [
+            Extension(
+                "_drivetrain_cy",
+                ["_drivetrain_cy.pyx"],
+                include_dirs=[numpy.get_include()],
+                extra_compile_args=["-O3"],
+            )
+        ]
+    ),
+)
@@ -1,4 +1,6 @@
+import math
 import unittest
+
 from drivetrain import Drivetrain, GearRatioNotFoundError
 
 
@@ -56,6 +58,65 @@ class TestDrivetrain(unittest.TestCase):
             f"Rear cog {rear} is not in the drivetrain rear cogs {self.drivetrain.rear_cogs}.",
         )
 
+    def test_target_just_below_achievable_ratio(self):
+        """Test that a target just under an achievable ratio is not rounded up."""
+        target_ratio = math.nextafter(38 / 23, 0)
+        front, rear, ratio = self.drivetrain.get_gear_combination(target_ratio)
+        self.assertLessEqual(
+            ratio,
+            target_ratio,
+            f"Ratio exceeds the target. Expected <= {target_ratio}, but got {ratio}.",
+        )
+        self.assertEqual(
+            (front, rear),
+            (30, 19),
+            "Expected the next combination below 38/23 for a target just under it.",
+        )
+
+    def test_ordinary_target_on_large_drivetrain(self):
+        """Test an ordinary target on a drivetrain too large for the
+        specialized search, so the compiled int64 kernels run."""
+        big = Drivetrain(front_cogs=[28, 38, 48], rear_cogs=list(range(10, 40)))
+        target_ratio = 1.6
+        front, rear, ratio = big.get_gear_combination(target_ratio)
+        self.assertEqual(
+            (front, rear),
+            (48, 30),
+            f"Expected (48, 30) as the closest combination under {target_ratio}.",
+        )
+        self.assertLessEqual(
+            ratio,
+            target_ratio,
+            f"Ratio exceeds the target. Expected <= {target_ratio}, but got {ratio}.",
+        )
+
+    def test_huge_target_on_large_drivetrain(self):
+        """Test huge targets on a drivetrain too large for the specialized
+        search, which would overflow int64 in the compiled kernels."""
+        big = Drivetrain(front_cogs=[28, 38, 48], rear_cogs=list(range(10, 40)))
+        for target_ratio in (1e18, 1e300):
+            front, rear, ratio = big.get_gear_combination(target_ratio)
+            self.assertEqual(
+                (front, rear),
+                (48, 10),
+                f"Expected the overall largest ratio for target {target_ratio}.",
+            )
+
+    def test_non_finite_target_ratio(self):
+        """Test that non-finite targets behave like the float comparisons."""
+        front, rear, ratio = self.drivetrain.get_gear_combination(math.inf)
+        self.assertEqual(
+            (front, rear),
+            (38, 16),
+            "An infinite target should return the overall largest ratio.",
+        )
+        for target_ratio in (math.nan, -math.inf):
+            with self.assertRaises(
+                GearRatioNotFoundError,
+                msg=f"No combination should exist for target ratio {target_ratio}.",
+            ):
+                self.drivetrain.get_gear_combination(target_ratio)
+
     def test_no_valid_gear_combination(self):
         """Test handling of cases where no valid combination exists."""
         target_ratio = 0.3
@@ -88,6 +149,45 @@ class TestDrivetrain(unittest.TestCase):
             f"Final ratio in sequence exceeds target. Expected <= {target_ratio}, but got {sequence[-1][2]}.",
         )
 
+    def test_shift_sequence_arrays_match_tuples(self):
+        """Test that the array variant mirrors the tuple-list sequence."""
+        initial_gear = [38, 28]
+        target_ratio = 1.6
+        sequence = self.drivetrain.get_shift_sequence(target_ratio, initial_gear)
+        fronts, rears, ratios = self.drivetrain.get_shift_sequence_arrays(
+            target_ratio, initial_gear
+        )
+        self.assertEqual(
+            len(fronts),
+            len(sequence),
+            "Array variant produced a different number of steps.",
+        )
+        for step, front, rear, ratio in zip(sequence, fronts, rears, ratios):
+            self.assertEqual(step[0], front, "Front cogs differ between variants.")
+            self.assertEqual(step[1], rear, "Rear cogs differ between variants.")
+            self.assertAlmostEqual(
+                step[2], ratio, places=5, msg="Ratios differ between variants."
+            )
+
+    def test_shift_sequences_batch(self):
+        """Test that the batch API matches individual per-pair calls."""
+        targets = [1.6, 1.5]
+        gears = [[38, 28], [30, 16]]
+        batch = self.drivetrain.get_shift_sequences_batch(targets, gears)
+        self.assertEqual(len(batch), len(targets), "Batch size mismatch.")
+        for (fronts, rears, ratios), target, gear in zip(batch, targets, gears):
+            ef, er, eratio = self.drivetrain.get_shift_sequence_arrays(target, gear)
+            self.assertTrue(
+                (fronts == ef).all() and (rears == er).all(),
+                f"Batch sequence differs from single call for {target}, {gear}.",
+            )
+            self.assertAlmostEqual(
+                float(ratios[-1]),
+                float(eratio[-1]),
+                places=5,
+                msg="Final batch ratio differs from single call.",
+            )
+
     def test_format_shift_sequence_output(self):
         """Test the formatting of the shift sequence output."""
         sequence = [(30, 19, 1.5789), (30, 16, 1.875)]